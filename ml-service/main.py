@@ -2,17 +2,46 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
+from contextlib import asynccontextmanager
 import httpx
 import os
-import asyncio
 from datetime import datetime, timedelta
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from threadpoolctl import threadpool_limits
 import logging
 
 from insights_generator import InsightsGenerator
 
-app = FastAPI(title="ML Service", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Cap BLAS/OpenMP pools to the container CPU budget so sklearn doesn't
+    # oversubscribe the cores the async server also needs. Keep a reference:
+    # the limiter restores the original limits when garbage collected
+    app.state.threadpool_limiter = threadpool_limits(
+        limits=int(os.getenv("ML_NUM_THREADS", "4"))
+    )
+
+    # Run the nightly job on the server's event loop so it shares the
+    # generator's HTTP client and connection pool
+    scheduler = AsyncIOScheduler()
+    scheduler.add_job(
+        run_nightly_insights,
+        trigger=CronTrigger(hour=2, minute=0),  # Run at 2 AM daily
+        id="nightly_insights",
+        name="Generate nightly insights",
+        replace_existing=True,
+    )
+    scheduler.start()
+    logger.info("Scheduler started - nightly insights will run at 2 AM")
+    yield
+    scheduler.shutdown(wait=False)
+    # Close the shared HTTP client so pooled connections shut down cleanly
+    await insights_generator.client.aclose()
+
+
+app = FastAPI(title="ML Service", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -104,17 +133,6 @@ async def run_nightly_insights():
     except Exception as e:
         logger.error(f"Error in nightly insights generation: {str(e)}")
 
-# Initialize and start scheduler
-scheduler = BackgroundScheduler()
-scheduler.add_job(
-    func=lambda: asyncio.run(run_nightly_insights()),
-    trigger=CronTrigger(hour=2, minute=0),  # Run at 2 AM daily
-    id="nightly_insights",
-    name="Generate nightly insights",
-    replace_existing=True,
-)
-scheduler.start()
-logger.info("Scheduler started - nightly insights will run at 2 AM")
 
 if __name__ == "__main__":
     import uvicorn